@@ -3,8 +3,11 @@ Robot Framework Debug Listener
 Shows keyword execution in real-time for debugging with colored output
 Compatible with Robot Framework 7.x
 """
+import atexit
+import io
 import sys
 import os
+import time
 
 # ANSI Color codes for terminal output
 class Colors:
@@ -27,24 +30,101 @@ class Colors:
     BG_GREEN = '\033[42m'
 
 
+# Prebuilt tags with their SGR sequences collapsed into one escape each
+_SUITE_HDR = '\033[94;1m[SUITE]\033[0m '
+_SUITE_PASS_TAG = '\033[92;1m[SUITE PASS]\033[0m '
+_SUITE_FAIL_TAG = '\033[91;1m[SUITE FAIL]\033[0m '
+_TEST_HDR = '\033[95;1m[TEST]\033[0m '
+_PASS_TAG = '\033[92;1m[PASS]\033[0m '
+_FAIL_TAG = '\033[91;1m[FAIL]\033[0m '
+_SETUP_TAG = '\033[93m[SETUP]\033[0m '
+_TEARDOWN_TAG = '\033[93m[TEARDOWN]\033[0m '
+_KEYWORD_ARROW = '\033[97m>> '
+_FAILED_BADGE = '\033[41;97;1m FAILED \033[0m \033[91m'
+_ERROR_PREFIX = '\033[91m       Error: '
+_FAIL_MESSAGE_PREFIX = '\033[91m         '
+_DURATION_OPEN = ' \033[90m('
+_DURATION_CLOSE = ')\033[0m'
+
+# Line prefix and whether arguments are shown, by keyword type
+_KW_TYPE_TABLE = {
+    'SETUP': (_SETUP_TAG, True),
+    'TEARDOWN': (_TEARDOWN_TAG, True),
+}
+_KW_TYPE_TABLE.update(
+    (kw_type, (f'\033[96m[{kw_type}]\033[0m \033[2m', False))
+    for kw_type in ('FOR', 'ITERATION', 'FOR ITERATION', 'IF', 'ELSE IF', 'ELSE', 'TRY', 'EXCEPT', 'FINALLY')
+)
+
+# Keywords to hide (internal Robot Framework keywords)
+HIDDEN_KEYWORDS = frozenset({
+    'BuiltIn.Log', 'BuiltIn.Log Many', 'BuiltIn.Set Variable',
+    'BuiltIn.Set Test Variable', 'BuiltIn.Set Suite Variable',
+    'BuiltIn.Set Global Variable', 'BuiltIn.Convert To Integer',
+    'BuiltIn.Convert To String', 'BuiltIn.Convert To Number',
+    'BuiltIn.Catenate', 'BuiltIn.Get Variable Value',
+    'BuiltIn.Variable Should Exist', 'BuiltIn.Get Time',
+    'BuiltIn.Evaluate', 'BuiltIn.Return From Keyword',
+    'BuiltIn.Run Keyword If', 'BuiltIn.Run Keyword',
+    'BuiltIn.No Operation', 'BuiltIn.Comment', 'BuiltIn.Sleep',
+    'String.Convert To Upper Case', 'String.Convert To Lower Case',
+    'Collections.Get From List', 'Collections.Get From Dictionary',
+})
+
+# Control structures and SETUP/TEARDOWN are always shown
+_CONTROL_TYPES = frozenset({
+    'FOR', 'ITERATION', 'FOR ITERATION', 'IF', 'ELSE IF', 'ELSE',
+    'TRY', 'EXCEPT', 'FINALLY', 'SETUP', 'TEARDOWN',
+})
+
+# Library prefixes stripped from keyword names for cleaner output
+_LIB_PREFIXES = frozenset(('BuiltIn', 'String', 'Collections', 'OperatingSystem'))
+
+# Output is batched here and written on test/suite boundaries instead of per line
+_OUTPUT_BUFFER = io.StringIO()
+_FLUSH_THRESHOLD = 8192
+
+# Indent prefixes by depth, so _log does not rebuild them per line
+_INDENTS = tuple('  ' * i for i in range(64))
+
+
+def _flush_output():
+    """Write buffered output to stdout in a single call"""
+    data = _OUTPUT_BUFFER.getvalue()
+    if not data:
+        return
+    _OUTPUT_BUFFER.seek(0)
+    _OUTPUT_BUFFER.truncate()
+    if data.isascii():
+        sys.stdout.write(data)
+    else:
+        try:
+            sys.stdout.write(data)
+        except UnicodeEncodeError:
+            sys.stdout.write(data.encode('ascii', 'replace').decode('ascii'))
+    sys.stdout.flush()
+
+
+atexit.register(_flush_output)
+
+
+def _first_n_lines(text, n):
+    """Return up to the first n lines of text without splitting all of it"""
+    lines = []
+    start = 0
+    for _ in range(n):
+        end = text.find('\n', start)
+        if end < 0:
+            lines.append(text[start:])
+            break
+        lines.append(text[start:end])
+        start = end + 1
+    return lines
+
+
 class DebugListener:
     ROBOT_LISTENER_API_VERSION = 2
     
-    # Keywords to hide (internal Robot Framework keywords)
-    HIDDEN_KEYWORDS = {
-        'BuiltIn.Log', 'BuiltIn.Log Many', 'BuiltIn.Set Variable',
-        'BuiltIn.Set Test Variable', 'BuiltIn.Set Suite Variable',
-        'BuiltIn.Set Global Variable', 'BuiltIn.Convert To Integer',
-        'BuiltIn.Convert To String', 'BuiltIn.Convert To Number',
-        'BuiltIn.Catenate', 'BuiltIn.Get Variable Value',
-        'BuiltIn.Variable Should Exist', 'BuiltIn.Get Time',
-        'BuiltIn.Evaluate', 'BuiltIn.Return From Keyword',
-        'BuiltIn.Run Keyword If', 'BuiltIn.Run Keyword',
-        'BuiltIn.No Operation', 'BuiltIn.Comment', 'BuiltIn.Sleep',
-        'String.Convert To Upper Case', 'String.Convert To Lower Case',
-        'Collections.Get From List', 'Collections.Get From Dictionary',
-    }
-    
     # Only show keywords up to this depth (0 = test level, 1 = first keyword, etc.)
     MAX_DEPTH = 2
     
@@ -55,6 +135,8 @@ class DebugListener:
         self.skipped_count = 0
         # Test results tracking
         self.test_results = []  # List of (name, status, message, duration)
+        self.passed_count = 0
+        self.failed_list = []  # Failed entries of test_results, kept for the summary
         self.suite_name = ""
         self.current_test_start = None
         # Enable ANSI colors on Windows
@@ -73,86 +155,94 @@ class DebugListener:
         self._log(f"{Colors.CYAN}{Colors.BOLD}=== Debug Listener Started ==={Colors.RESET}")
     
     def _log(self, message):
-        """Output with flush for immediate display"""
-        indent_str = "  " * self.indent
-        try:
-            print(f"{indent_str}{message}", flush=True)
-        except UnicodeEncodeError:
-            safe_msg = message.encode('ascii', 'replace').decode('ascii')
-            print(f"{indent_str}{safe_msg}", flush=True)
+        """Append a line to the output buffer"""
+        indent = self.indent
+        _OUTPUT_BUFFER.write(_INDENTS[indent] if indent < 64 else '  ' * indent)
+        _OUTPUT_BUFFER.write(message)
+        _OUTPUT_BUFFER.write('\n')
+        self._maybe_flush()
+    
+    def _maybe_flush(self):
+        """Flush the output buffer once it grows past the threshold"""
+        if _OUTPUT_BUFFER.tell() >= _FLUSH_THRESHOLD:
+            _flush_output()
     
     def start_suite(self, name, attrs):
         self.suite_name = name
         self.test_results = []  # Reset for each top-level suite
-        self._log(f"{Colors.BLUE}{Colors.BOLD}[SUITE]{Colors.RESET} {Colors.WHITE}{name}{Colors.RESET}")
+        self.passed_count = 0
+        self.failed_list = []
+        self._log(_SUITE_HDR + Colors.WHITE + name + Colors.RESET)
         self.indent += 1
     
     def end_suite(self, name, attrs):
         self.indent -= 1
         status = attrs.get('status', 'PASS')
         if status == 'PASS':
-            self._log(f"{Colors.GREEN}{Colors.BOLD}[SUITE PASS]{Colors.RESET} {name}")
+            self._log(_SUITE_PASS_TAG + name)
         else:
-            self._log(f"{Colors.RED}{Colors.BOLD}[SUITE FAIL]{Colors.RESET} {name}")
+            self._log(_SUITE_FAIL_TAG + name)
         
         # Print summary at the end of the top-level suite
         if self.indent == 0 and self.test_results:
             self._print_summary()
+        _flush_output()
     
     def _print_summary(self):
-        """Print a summary of all test results"""
-        passed = [t for t in self.test_results if t[1] == 'PASS']
-        failed = [t for t in self.test_results if t[1] == 'FAIL']
+        """Print a summary of all test results as a single block"""
+        failed = self.failed_list
+        out = []
         
-        print("\n", flush=True)
-        print(f"{Colors.CYAN}{Colors.BOLD}{'='*80}{Colors.RESET}", flush=True)
-        print(f"{Colors.CYAN}{Colors.BOLD}  TEST EXECUTION SUMMARY{Colors.RESET}", flush=True)
-        print(f"{Colors.CYAN}{Colors.BOLD}{'='*80}{Colors.RESET}", flush=True)
+        out.append("\n\n")
+        out.append(f"{Colors.CYAN}{Colors.BOLD}{'='*80}{Colors.RESET}\n")
+        out.append(f"{Colors.CYAN}{Colors.BOLD}  TEST EXECUTION SUMMARY{Colors.RESET}\n")
+        out.append(f"{Colors.CYAN}{Colors.BOLD}{'='*80}{Colors.RESET}\n")
         
         # List all tests
-        print(f"\n{Colors.WHITE}{Colors.BOLD}All Tests ({len(self.test_results)}):{Colors.RESET}", flush=True)
+        out.append(f"\n{Colors.WHITE}{Colors.BOLD}All Tests ({len(self.test_results)}):{Colors.RESET}\n")
         for test_name, status, message, duration in self.test_results:
             if status == 'PASS':
                 icon = f"{Colors.GREEN}[PASS]{Colors.RESET}"
             else:
                 icon = f"{Colors.RED}[FAIL]{Colors.RESET}"
             duration_str = f" ({duration})" if duration else ""
-            print(f"  {icon} {test_name}{Colors.GRAY}{duration_str}{Colors.RESET}", flush=True)
+            out.append(f"  {icon} {test_name}{Colors.GRAY}{duration_str}{Colors.RESET}\n")
         
         # Summary counts
-        print(f"\n{Colors.WHITE}{Colors.BOLD}Results:{Colors.RESET}", flush=True)
-        print(f"  {Colors.GREEN}Passed: {len(passed)}{Colors.RESET}", flush=True)
-        print(f"  {Colors.RED}Failed: {len(failed)}{Colors.RESET}", flush=True)
+        out.append(f"\n{Colors.WHITE}{Colors.BOLD}Results:{Colors.RESET}\n")
+        out.append(f"  {Colors.GREEN}Passed: {self.passed_count}{Colors.RESET}\n")
+        out.append(f"  {Colors.RED}Failed: {len(failed)}{Colors.RESET}\n")
         
         # Failed test details
         if failed:
-            print(f"\n{Colors.RED}{Colors.BOLD}{'='*80}{Colors.RESET}", flush=True)
-            print(f"{Colors.RED}{Colors.BOLD}  FAILURE DETAILS{Colors.RESET}", flush=True)
-            print(f"{Colors.RED}{Colors.BOLD}{'='*80}{Colors.RESET}", flush=True)
+            out.append(f"\n{Colors.RED}{Colors.BOLD}{'='*80}{Colors.RESET}\n")
+            out.append(f"{Colors.RED}{Colors.BOLD}  FAILURE DETAILS{Colors.RESET}\n")
+            out.append(f"{Colors.RED}{Colors.BOLD}{'='*80}{Colors.RESET}\n")
             
             for i, (test_name, status, message, duration) in enumerate(failed, 1):
-                print(f"\n{Colors.RED}{Colors.BOLD}{i}. {test_name}{Colors.RESET}", flush=True)
+                out.append(f"\n{Colors.RED}{Colors.BOLD}{i}. {test_name}{Colors.RESET}\n")
                 if message:
                     # Format error message with line breaks for readability
-                    error_lines = message.split('\n')
-                    for line in error_lines[:5]:  # Limit to first 5 lines
-                        print(f"   {Colors.YELLOW}{line[:200]}{Colors.RESET}", flush=True)
-                    if len(error_lines) > 5:
-                        print(f"   {Colors.GRAY}... ({len(error_lines) - 5} more lines){Colors.RESET}", flush=True)
+                    for line in _first_n_lines(message, 5):  # Limit to first 5 lines
+                        out.append(f"   {Colors.YELLOW}{line[:200]}{Colors.RESET}\n")
+                    more_lines = message.count('\n') - 4
+                    if more_lines > 0:
+                        out.append(f"   {Colors.GRAY}... ({more_lines} more lines){Colors.RESET}\n")
         
-        print(f"\n{Colors.CYAN}{'='*80}{Colors.RESET}\n", flush=True)
+        out.append(f"\n{Colors.CYAN}{'='*80}{Colors.RESET}\n\n")
+        
+        # Goes out with the rest of the buffer in the caller's flush
+        _OUTPUT_BUFFER.write(''.join(out))
     
     def start_test(self, name, attrs):
-        import time
         self.current_test_start = time.time()
-        self._log(f"{Colors.MAGENTA}{Colors.BOLD}[TEST]{Colors.RESET} {Colors.WHITE}{name}{Colors.RESET}")
+        self._log(_TEST_HDR + Colors.WHITE + name + Colors.RESET)
         self.indent += 1
         self.failed_keywords = []
         self.keyword_depth = 0
         self.skipped_count = 0
     
     def end_test(self, name, attrs):
-        import time
         self.indent -= 1
         status = attrs.get('status', 'PASS')
         message = attrs.get('message', '')
@@ -167,65 +257,56 @@ class DebugListener:
                 duration = f"{elapsed:.1f}s"
         
         # Store test result
-        self.test_results.append((name, status, message, duration))
+        result = (name, status, message, duration)
+        self.test_results.append(result)
+        if status == 'PASS':
+            self.passed_count += 1
+        elif status == 'FAIL':
+            self.failed_list.append(result)
         
         if status == 'PASS':
-            self._log(f"{Colors.GREEN}{Colors.BOLD}[PASS]{Colors.RESET} {name} {Colors.GRAY}({duration}){Colors.RESET}")
+            self._log(_PASS_TAG + name + _DURATION_OPEN + duration + _DURATION_CLOSE)
         else:
-            self._log(f"{Colors.RED}{Colors.BOLD}[FAIL]{Colors.RESET} {name} {Colors.GRAY}({duration}){Colors.RESET}")
+            self._log(_FAIL_TAG + name + _DURATION_OPEN + duration + _DURATION_CLOSE)
             if message:
-                self._log(f"{Colors.RED}       Error: {message[:300]}{Colors.RESET}")
+                self._log(_ERROR_PREFIX + message[:300] + Colors.RESET)
+        _flush_output()
     
     def start_keyword(self, name, attrs):
-        kw_type = attrs.get('type', 'KEYWORD')
-        args = attrs.get('args', [])
-        
         self.keyword_depth += 1
+        kw_type = attrs.get('type', 'KEYWORD')
         
-        # Skip internal keywords when too deep
-        is_hidden = name in self.HIDDEN_KEYWORDS
-        is_too_deep = self.keyword_depth > self.MAX_DEPTH
-        
-        # Always show control structures and SETUP/TEARDOWN
-        is_control = kw_type in ('FOR', 'ITERATION', 'FOR ITERATION', 'IF', 'ELSE IF', 'ELSE', 'TRY', 'EXCEPT', 'FINALLY', 'SETUP', 'TEARDOWN')
-        
-        if is_hidden or (is_too_deep and not is_control):
+        # Skip hidden keywords, and anything too deep except control structures
+        # and SETUP/TEARDOWN, before doing any formatting work
+        if name in HIDDEN_KEYWORDS or (self.keyword_depth > self.MAX_DEPTH and kw_type not in _CONTROL_TYPES):
             self.skipped_count += 1
             return
         
+        args = attrs.get('args', [])
         args_str = ""
         if args:
             args_list = [str(a)[:50] for a in args[:4]]
             args_str = f" {Colors.GRAY}({', '.join(args_list)}{'...' if len(args) > 4 else ''}){Colors.RESET}"
         
-        if kw_type == 'SETUP':
-            self._log(f"{Colors.YELLOW}[SETUP]{Colors.RESET} {name}{args_str}")
-            self.indent += 1
-        elif kw_type == 'TEARDOWN':
-            self._log(f"{Colors.YELLOW}[TEARDOWN]{Colors.RESET} {name}{args_str}")
-            self.indent += 1
-        elif kw_type in ('FOR', 'ITERATION', 'FOR ITERATION'):
-            self._log(f"{Colors.CYAN}[{kw_type}]{Colors.RESET} {Colors.DIM}{name}{Colors.RESET}")
-            self.indent += 1
-        elif kw_type in ('IF', 'ELSE IF', 'ELSE'):
-            self._log(f"{Colors.CYAN}[{kw_type}]{Colors.RESET} {Colors.DIM}{name}{Colors.RESET}")
-            self.indent += 1
-        elif kw_type in ('TRY', 'EXCEPT', 'FINALLY'):
-            self._log(f"{Colors.CYAN}[{kw_type}]{Colors.RESET} {Colors.DIM}{name}{Colors.RESET}")
-            self.indent += 1
-        else:
+        entry = _KW_TYPE_TABLE.get(kw_type)
+        if entry is None:
             # Regular keyword - show with arrow, remove library prefix for cleaner output
-            display_name = name.split('.')[-1] if '.' in name and name.startswith(('BuiltIn.', 'String.', 'Collections.', 'OperatingSystem.')) else name
-            self._log(f"{Colors.WHITE}>> {display_name}{Colors.RESET}{args_str}")
-            self.indent += 1
+            head, sep, tail = name.partition('.')
+            display_name = tail if sep and head in _LIB_PREFIXES else name
+            self._log(_KEYWORD_ARROW + display_name + Colors.RESET + args_str)
+        elif entry[1]:
+            self._log(entry[0] + name + args_str)
+        else:
+            self._log(entry[0] + name + Colors.RESET)
+        self.indent += 1
     
     def end_keyword(self, name, attrs):
         kw_type = attrs.get('type', 'KEYWORD')
         
         # Check if this keyword was skipped
-        is_hidden = name in self.HIDDEN_KEYWORDS
+        is_hidden = name in HIDDEN_KEYWORDS
         is_too_deep = self.keyword_depth > self.MAX_DEPTH
-        is_control = kw_type in ('FOR', 'ITERATION', 'FOR ITERATION', 'IF', 'ELSE IF', 'ELSE', 'TRY', 'EXCEPT', 'FINALLY', 'SETUP', 'TEARDOWN')
+        is_control = kw_type in _CONTROL_TYPES
         
         was_shown = not is_hidden and (not is_too_deep or is_control)
         
@@ -237,15 +318,18 @@ class DebugListener:
         status = attrs.get('status', 'PASS')
         if status == 'FAIL':
             message = attrs.get('message', '')
-            display_name = name.split('.')[-1] if '.' in name and name.startswith(('BuiltIn.', 'String.', 'Collections.')) else name
-            self._log(f"{Colors.BG_RED}{Colors.WHITE}{Colors.BOLD} FAILED {Colors.RESET} {Colors.RED}{display_name}{Colors.RESET}")
+            head, sep, tail = name.partition('.')
+            display_name = tail if sep and head in _LIB_PREFIXES else name
+            self._log(_FAILED_BADGE + display_name + Colors.RESET)
             if message:
-                self._log(f"{Colors.RED}         {message[:250]}{Colors.RESET}")
+                self._log(_FAIL_MESSAGE_PREFIX + message[:250] + Colors.RESET)
     
     def log_message(self, message):
         # Only show WARN and ERROR messages, skip INFO/DEBUG for cleaner output
-        level = message.get('level', 'INFO') if isinstance(message, dict) else getattr(message, 'level', 'INFO')
-        msg = message.get('message', '') if isinstance(message, dict) else getattr(message, 'message', '')
+        if isinstance(message, dict):
+            level, msg = message.get('level', 'INFO'), message.get('message', '')
+        else:
+            level, msg = getattr(message, 'level', 'INFO'), getattr(message, 'message', '')
         
         if level == 'WARN':
             self._log(f"{Colors.YELLOW}[WARN]{Colors.RESET} {msg[:150]}")
@@ -3,12 +3,173 @@ Enhanced Debug Listener for Robot Framework
 Implements keyword-level debugging with breakpoints, stepping, and variable inspection.
 Uses file-based communication for pause/resume mechanism.
 """
+import atexit
 import json
+import threading
 import time
 import os
+import reprlib
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Set, Any, List, Optional
+from itertools import islice
+from typing import Dict, FrozenSet, Set, Any, Iterator, List, Optional, Tuple
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # watchdog is optional - without it the pause loop polls
+    FileSystemEventHandler = object
+    Observer = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib encoder
+    orjson = None
+
+# Keyword types that get a "completed" line when they pass
+_COMPLETION_TYPES = frozenset({'SETUP', 'TEARDOWN', 'FOR', 'IF', 'TRY'})
+
+# Character classes for argument type detection
+_VARIABLE_SIGILS = frozenset('$@&')
+_NUMERIC_CHARS = frozenset('0123456789.-')
+_LITERAL_WORDS = frozenset(('true', 'false', 'none', 'null'))
+
+# Robot's built-in test and suite variables, exported in their own scopes.
+# BuiltIn.get_variables() returns them with underscores, not spaces
+_TEST_VARIABLES = frozenset((
+    '${TEST_NAME}', '@{TEST_TAGS}', '${TEST_DOCUMENTATION}', '${TEST_STATUS}', '${TEST_MESSAGE}',
+    '&{TEST_METADATA}',
+))
+_SUITE_VARIABLES = frozenset((
+    '${SUITE_NAME}', '${SUITE_SOURCE}', '${SUITE_DOCUMENTATION}', '&{SUITE_METADATA}',
+    '${SUITE_STATUS}', '${SUITE_MESSAGE}',
+))
+
+# Pause polling backs off from the initial to the max delay (seconds)
+_POLL_INITIAL_DELAY = 0.005
+_POLL_MAX_DELAY = 0.1
+_BREAKPOINT_RELOAD_INTERVAL = 3.0
+
+# Longest variable value exported to the debugger
+_MAX_VALUE_LENGTH = 500
+# Most values formatted for one exported container variable
+_MAX_REPR_VALUES = 200
+
+# Console lines queued before they are written out
+_LOG_BATCH_LINES = 64
+
+# Box-drawing borders for test and pause banners
+_BOX_TOP = '╔' + '═' * 78 + '╗'
+_BOX_BOTTOM = '╚' + '═' * 78 + '╝'
+_PAUSE_RULE = '═' * 60
+_PAUSE_DIVIDER = '─' * 60
+
+
+@lru_cache(maxsize=1024)
+def _norm(path: str) -> str:
+    """os.path.normpath, memoized - Robot reuses a handful of source paths"""
+    return os.path.normpath(path)
+
+
+@lru_cache(maxsize=1024)
+def _base(path: str) -> str:
+    """os.path.basename, memoized for the same reason"""
+    return os.path.basename(path)
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Yield the lines of text one at a time without splitting all of it"""
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        if end < 0:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+class _ValueRepr(reprlib.Repr):
+    """Bounded repr for variable values: large containers are cut off early
+    instead of being stringified in full and truncated afterwards"""
+
+    # Subclasses (DotDict, OrderedDict, defaultdict, ...) are formatted like
+    # their base type; reprlib would otherwise call the full repr() on them
+    _BASE_METHODS = (
+        (dict, 'repr_dict'), (list, 'repr_list'), (tuple, 'repr_tuple'),
+        (set, 'repr_set'), (frozenset, 'repr_frozenset'), (str, 'repr_str'),
+    )
+
+    def __init__(self):
+        super().__init__()
+        self.maxlevel = 6
+        self.maxlist = self.maxtuple = self.maxset = self.maxfrozenset = 20
+        self.maxdict = 20
+        self.maxstring = self.maxother = _MAX_VALUE_LENGTH
+        # Values formatted per top-level call; nesting multiplies the
+        # per-container caps, so this keeps the total bounded
+        self._budget = 0
+
+    def repr(self, x):
+        self._budget = _MAX_REPR_VALUES
+        return super().repr(x)
+
+    def repr1(self, x, level):
+        if self._budget <= 0:
+            return '...'
+        self._budget -= 1
+        if not hasattr(self, 'repr_' + type(x).__name__):
+            for base, method in self._BASE_METHODS:
+                if isinstance(x, base):
+                    return getattr(self, method)(x, level)
+        return super().repr1(x, level)
+
+    def repr_dict(self, x, level):
+        # Keep insertion order; reprlib sorts the keys
+        if not x:
+            return '{}'
+        if level <= 0:
+            return '{...}'
+        repr1 = self.repr1
+        pieces = [
+            f"{repr1(key, level - 1)}: {repr1(value, level - 1)}"
+            for key, value in islice(x.items(), self.maxdict)
+        ]
+        if len(x) > self.maxdict:
+            pieces.append('...')
+        return '{' + ', '.join(pieces) + '}'
+
+
+_CONTAINER_TYPES = (list, tuple, dict, set, frozenset)
+_value_repr = _ValueRepr().repr
+
+
+def _load_json(data: bytes) -> Any:
+    """Parse UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dump_json(data: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+class _ControlFileHandler(FileSystemEventHandler):
+    """Wakes the paused listener when the debugger touches a control file"""
+
+    def __init__(self, paths: Set[str], event: threading.Event):
+        self._paths = paths
+        self._event = event
+
+    def on_any_event(self, event):
+        if (os.path.abspath(event.src_path) in self._paths
+                or os.path.abspath(getattr(event, 'dest_path', '') or '.') in self._paths):
+            self._event.set()
 
 
 class DebugListener:
@@ -17,40 +178,93 @@ class DebugListener:
 
     Communication Protocol:
     - Breakpoints: Read from .rf_debug_breakpoints.json
-    - Pause: Create .rf_debug_pause file
+    - Pause: Write .rf_debug_pause with 'paused' on the first line and the
+      reason on the second
     - Resume: Delete .rf_debug_pause file
-    - Step: Read .rf_debug_step file (contains: 'over', 'into', 'out')
-    - Variables: Write to .rf_debug_variables.json
+    - Step: The debugger overwrites .rf_debug_pause with 'step:over',
+      'step:into' or 'step:out'; the listener deletes it and resumes
+    - Call stack: Write to .rf_debug_stack.json on pause
+    - Variables: Write to .rf_debug_variables.json when .rf_debug_request_vars
+      appears while paused, then delete the request file
     """
 
     ROBOT_LISTENER_API_VERSION = 2
 
+    # Every hook reads several of these, so keep them out of a per-instance dict
+    __slots__ = (
+        # Console output
+        '_stderr_fd', '_log_buf', '_verbose', 'colors_enabled',
+        # Communication files
+        'pause_file', 'breakpoint_file', 'variable_file', 'var_request_file', 'stack_file',
+        # Breakpoints
+        '_bp_index', '_bp_sources', '_bp_mtime',
+        # Stepping and call stack
+        '_active', 'stepping_mode', 'step_depth', 'current_depth', 'keyword_stack',
+        # Pause file watcher
+        '_resume_event', '_observer',
+        # Colors and precomputed line fragments
+        'RESET', 'BOLD', 'DIM', 'RED', 'GREEN', 'YELLOW', 'BLUE', 'MAGENTA', 'CYAN', 'WHITE', 'GRAY', 'BG_RED',
+        '_kw_heads', '_kw_default_head',
+        '_tpl_args_open', '_tpl_args_close', '_tpl_arg', '_tpl_more_args', '_tpl_lineno',
+        '_tpl_kw_failed', '_tpl_fail_line', '_tpl_kw_completed',
+        '_tpl_test_start', '_tpl_test_tags', '_tpl_test_passed', '_tpl_test_failed', '_tpl_test_error',
+        '_cyan_box_top', '_cyan_box_bottom', '_green_box_top', '_green_box_bottom',
+        '_red_box_top', '_red_box_bottom', '_pause_rule', '_pause_divider',
+    )
+
     def __init__(self):
+        # Console lines are collected in _log_buf and written straight to the
+        # stderr file descriptor in batches: every _LOG_BATCH_LINES lines, at
+        # test end, on pause, on errors and at exit
+        try:
+            self._stderr_fd: Optional[int] = sys.stderr.fileno()
+        except (AttributeError, OSError, ValueError):
+            self._stderr_fd = None
+        self._log_buf: List[str] = []
+        atexit.register(self._flush_log)
+
         # Communication file paths (from environment variables)
         self.pause_file = Path(os.environ.get('RF_DEBUG_PAUSE_FILE', '.rf_debug_pause'))
         self.breakpoint_file = Path(os.environ.get('RF_DEBUG_BP_FILE', '.rf_debug_breakpoints.json'))
         self.variable_file = Path(os.environ.get('RF_DEBUG_VAR_FILE', '.rf_debug_variables.json'))
-        self.step_file = Path('.rf_debug_step')
+        self.var_request_file = Path(os.environ.get('RF_DEBUG_VAR_REQUEST_FILE', '.rf_debug_request_vars'))
+        self.stack_file = Path(os.environ.get('RF_DEBUG_STACK_FILE', '.rf_debug_stack.json'))
 
-        # Breakpoints: {file_path: {line_numbers}}
-        self.breakpoints: Dict[str, Set[int]] = {}
-        self._load_breakpoints()
+        # Breakpoints as a flat (normalized_path, line) index, plus the
+        # set of indexed paths so already-normalized sources skip normpath
+        self._bp_index: FrozenSet[Tuple[str, int]] = frozenset()
+        self._bp_sources: FrozenSet[str] = frozenset()
+        # mtime of the breakpoint file when it was last loaded
+        self._bp_mtime = 0
 
         # Stepping state
         self.stepping_mode: Optional[str] = None  # 'over', 'into', 'out', None
         self.step_depth = 0
         self.current_depth = 0
+        # True while there are breakpoints or a step in progress; the keyword
+        # hooks do nothing else otherwise. Both only change in
+        # _load_breakpoints and _pause_execution, which recompute it
+        self._active = False
 
         # Call stack for debugging
         self.keyword_stack: List[Dict[str, Any]] = []
 
+        # Per-keyword console lines are opt-in with RF_DEBUG_VERBOSE=1
+        self._verbose = os.environ.get('RF_DEBUG_VERBOSE') == '1'
+
+        # File watcher used while paused, started on the first pause
+        self._resume_event = threading.Event()
+        self._observer = None
+
         # Colors for console output
         self.colors_enabled = True
         self._setup_colors()
 
+        self._load_breakpoints()
+
         self._log(f"{self.CYAN}{self.BOLD}=== Enhanced Debug Listener Started ==={self.RESET}")
         self._log(f"{self.GRAY}Breakpoint file: {self.breakpoint_file}{self.RESET}")
-        self._log(f"{self.GRAY}Loaded {sum(len(lines) for lines in self.breakpoints.values())} breakpoint(s){self.RESET}")
+        self._log(f"{self.GRAY}Loaded {len(self._bp_index)} breakpoint(s){self.RESET}")
 
     def _setup_colors(self):
         """Setup ANSI color codes"""
@@ -75,36 +289,116 @@ class DebugListener:
         self.GRAY = '\033[90m' if self.colors_enabled else ''
         self.BG_RED = '\033[41m' if self.colors_enabled else ''
 
+        # Keyword line prefix (icon, type label, name color) by keyword type;
+        # anything else is a regular keyword
+        self._kw_heads = {
+            kw_type: f"{icon} {label_color}[{label}]{self.RESET} {color}{self.BOLD}"
+            for kw_type, icon, color, label_color, label in (
+                ('SETUP', "🔧", self.YELLOW, self.YELLOW, 'SETUP'),
+                ('TEARDOWN', "🧹", self.YELLOW, self.YELLOW, 'TEARDOWN'),
+                ('FOR', "🔄", self.CYAN, self.CYAN, 'FOR'),
+                ('FOR ITERATION', "  ↻", self.CYAN, self.DIM + self.CYAN, 'ITER'),
+                ('IF', "❓", self.MAGENTA, self.MAGENTA, 'IF'),
+                ('ELSE IF', "❔", self.MAGENTA, self.MAGENTA, 'ELIF'),
+                ('ELSE', "❕", self.MAGENTA, self.MAGENTA, 'ELSE'),
+                ('TRY', "🎯", self.BLUE, self.BLUE, 'TRY'),
+                ('EXCEPT', "⚠️", self.YELLOW, self.YELLOW, 'EXCEPT'),
+                ('FINALLY', "✓", self.BLUE, self.BLUE, 'FINALLY'),
+            )
+        }
+        self._kw_default_head = f"→ {self.BLUE}"
+
+        # Line templates with the colors baked in, filled with str.format
+        self._tpl_args_open = f" {self.GRAY}({self.RESET}"
+        self._tpl_args_close = f"{self.GRAY}){self.RESET}"
+        self._tpl_arg = "{}{}" + self.RESET
+        self._tpl_more_args = f", {self.DIM}+{{}} more{self.RESET}"
+        self._tpl_lineno = f"{self.DIM}:{{}}{self.RESET}"
+        self._tpl_kw_failed = f"{{}}{self.BG_RED}{self.WHITE}{self.BOLD} ✗ FAILED {self.RESET} {self.RED}{self.BOLD}{{}}{self.RESET}"
+        self._tpl_fail_line = f"{{}}  {self.RED}│{self.RESET} {{}}"
+        self._tpl_kw_completed = f"{{}}{self.GREEN}✓{self.RESET} {self.DIM}{{}} completed{self.RESET}"
+        self._tpl_test_start = f"{self.CYAN}║{self.RESET} {self.WHITE}{self.BOLD}{{}}{self.RESET}"
+        self._tpl_test_tags = f"{self.CYAN}║{self.RESET} {self.DIM}Tags: {{}}{self.RESET}"
+        self._tpl_test_passed = f"{self.GREEN}║{self.RESET} {self.WHITE}{{}}{self.RESET}"
+        self._tpl_test_failed = f"{self.RED}║{self.RESET} {self.WHITE}{{}}{self.RESET}"
+        self._tpl_test_error = f"{self.RED}║{self.RESET} {self.RED}{{}}{self.RESET}"
+
+        # Colored banner borders
+        self._cyan_box_top = f"{self.CYAN}{_BOX_TOP}{self.RESET}"
+        self._cyan_box_bottom = f"{self.CYAN}{_BOX_BOTTOM}{self.RESET}"
+        self._green_box_top = f"{self.GREEN}{_BOX_TOP}{self.RESET}"
+        self._green_box_bottom = f"{self.GREEN}{_BOX_BOTTOM}{self.RESET}"
+        self._red_box_top = f"{self.RED}{_BOX_TOP}{self.RESET}"
+        self._red_box_bottom = f"{self.RED}{_BOX_BOTTOM}{self.RESET}"
+        self._pause_rule = f"{self.YELLOW}{_PAUSE_RULE}{self.RESET}"
+        self._pause_divider = f"{self.YELLOW}{_PAUSE_DIVIDER}{self.RESET}"
+
     def _log(self, message: str):
-        """Output with flush for immediate display"""
+        """Queue a console line, writing the batch once it is full"""
+        buf = self._log_buf
+        buf.append(message)
+        if len(buf) >= _LOG_BATCH_LINES:
+            self._flush_log()
+
+    def _flush_log(self):
+        """Write queued console lines to stderr in one system call"""
+        buf = self._log_buf
+        if not buf:
+            return
+        buf.append('')
+        text = '\n'.join(buf)
+        buf.clear()
+        fd = self._stderr_fd
         try:
-            print(message, flush=True, file=sys.stderr)
-        except UnicodeEncodeError:
-            safe_msg = message.encode('ascii', 'replace').decode('ascii')
-            print(safe_msg, flush=True, file=sys.stderr)
+            if fd is None:
+                sys.stderr.write(text)
+                sys.stderr.flush()
+                return
+            data = text.encode('utf-8', 'replace')
+            written = os.write(fd, data)
+            while written < len(data):
+                written += os.write(fd, data[written:])
+        except (OSError, ValueError):
+            pass
 
     def _load_breakpoints(self):
-        """Load breakpoints from JSON file"""
-        if not self.breakpoint_file.exists():
+        """Load breakpoints from JSON file, if it changed since the last load"""
+        try:
+            mtime = self.breakpoint_file.stat().st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._bp_mtime:
             return
 
+        # The debugger rewrites the whole file, so it replaces the current set.
+        # On a parse error (e.g. a half-written file) keep the old set and
+        # retry on the next check
         try:
-            with open(self.breakpoint_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                for source_path, lines in data.items():
-                    # Normalize path separators
-                    normalized_path = os.path.normpath(source_path)
-                    self.breakpoints[normalized_path] = set(lines)
+            data = _load_json(self.breakpoint_file.read_bytes())
+            bp_index = frozenset(
+                (_norm(source_path), line)  # Normalize path separators
+                for source_path, lines in data.items()
+                for line in lines
+            )
         except Exception as e:
             self._log(f"{self.RED}[DEBUG ERROR] Failed to load breakpoints: {e}{self.RESET}")
+            return
+        self._bp_mtime = mtime
+        self._bp_index = bp_index
+        self._bp_sources = frozenset(path for path, _ in bp_index)
+        self._update_active()
+
+    def _update_active(self):
+        """Recompute whether the keyword hooks need to check anything"""
+        self._active = bool(self._bp_index) or self.stepping_mode is not None
 
     def start_test(self, name: str, attributes: Dict[str, Any]):
         """Called when a test starts"""
         # Draw test start box
         self._log("")
-        self._log(f"{self.CYAN}{'╔' + '═' * 78 + '╗'}{self.RESET}")
+        self._log(self._cyan_box_top)
         self._log(f"{self.CYAN}║{self.RESET} {self.MAGENTA}{self.BOLD}🧪 TEST START{self.RESET}")
-        self._log(f"{self.CYAN}║{self.RESET} {self.WHITE}{self.BOLD}{name}{self.RESET}")
+        self._log(self._tpl_test_start.format(name))
 
         # Show tags if present
         tags = attributes.get('tags', [])
@@ -112,9 +406,9 @@ class DebugListener:
             tags_str = ', '.join(tags[:5])
             if len(tags) > 5:
                 tags_str += f" +{len(tags) - 5} more"
-            self._log(f"{self.CYAN}║{self.RESET} {self.DIM}Tags: {tags_str}{self.RESET}")
+            self._log(self._tpl_test_tags.format(tags_str))
 
-        self._log(f"{self.CYAN}{'╚' + '═' * 78 + '╝'}{self.RESET}")
+        self._log(self._cyan_box_bottom)
         self._log("")
 
         self.keyword_stack = []
@@ -128,198 +422,175 @@ class DebugListener:
         # Draw test result box
         self._log("")
         if status == 'PASS':
-            self._log(f"{self.GREEN}{'╔' + '═' * 78 + '╗'}{self.RESET}")
+            self._log(self._green_box_top)
             self._log(f"{self.GREEN}║{self.RESET} {self.GREEN}{self.BOLD}✓ TEST PASSED{self.RESET}")
-            self._log(f"{self.GREEN}║{self.RESET} {self.WHITE}{name}{self.RESET}")
-            self._log(f"{self.GREEN}{'╚' + '═' * 78 + '╝'}{self.RESET}")
+            self._log(self._tpl_test_passed.format(name))
+            self._log(self._green_box_bottom)
         else:
-            self._log(f"{self.RED}{'╔' + '═' * 78 + '╗'}{self.RESET}")
+            self._log(self._red_box_top)
             self._log(f"{self.RED}║{self.RESET} {self.RED}{self.BOLD}✗ TEST FAILED{self.RESET}")
-            self._log(f"{self.RED}║{self.RESET} {self.WHITE}{name}{self.RESET}")
+            self._log(self._tpl_test_failed.format(name))
             if message:
                 # Show first line of error
                 first_line = message.split('\n')[0][:70]
-                self._log(f"{self.RED}║{self.RESET} {self.RED}{first_line}{self.RESET}")
-            self._log(f"{self.RED}{'╚' + '═' * 78 + '╝'}{self.RESET}")
+                self._log(self._tpl_test_error.format(first_line))
+            self._log(self._red_box_bottom)
         self._log("")
+        self._flush_log()
 
     def start_keyword(self, name: str, attributes: Dict[str, Any]):
         """Called when a keyword starts - check for breakpoints and pause if needed"""
-        self.current_depth += 1
+        get = attributes.get
+        depth = self.current_depth + 1
+        self.current_depth = depth
 
-        source = attributes.get('source', '')
-        lineno = attributes.get('lineno', 0)
-        args = attributes.get('args', [])
-        kw_type = attributes.get('type', 'KEYWORD')
+        if self._verbose:
+            self._log_keyword(get('kwname', name), get('type', 'KEYWORD'), get('args', []), get('lineno', 0), depth)
+
+        # Without breakpoints or a step in progress there is nothing to check,
+        # and the call stack is only read while paused, so skip it too. Both can
+        # only change during a pause, which needs one of them to be active
+        if not self._active:
+            return
+
+        source = get('source', '')
+        lineno = get('lineno', 0)
+        args = get('args', [])
+        kw_type = get('type', 'KEYWORD')
+        display_name = get('kwname', name)
 
         # Push to stack
-        keyword_frame = {
+        self.keyword_stack.append({
             'name': name,
-            'kwname': attributes.get('kwname', name),
+            'kwname': display_name,
             'source': source,
             'lineno': lineno,
             'args': args,
-            'depth': self.current_depth,
+            'depth': depth,
             'type': kw_type
-        }
-        self.keyword_stack.append(keyword_frame)
-
-        # Log keyword execution with type-specific formatting
-        display_name = attributes.get('kwname', name)
-        indent = "  " * (self.current_depth - 1)
-
-        # Choose icon and color based on keyword type
-        if kw_type == 'SETUP':
-            icon = "🔧"
-            color = self.YELLOW
-            type_label = f"{self.YELLOW}[SETUP]{self.RESET}"
-        elif kw_type == 'TEARDOWN':
-            icon = "🧹"
-            color = self.YELLOW
-            type_label = f"{self.YELLOW}[TEARDOWN]{self.RESET}"
-        elif kw_type == 'FOR':
-            icon = "🔄"
-            color = self.CYAN
-            type_label = f"{self.CYAN}[FOR]{self.RESET}"
-        elif kw_type == 'FOR ITERATION':
-            icon = "  ↻"
-            color = self.CYAN
-            type_label = f"{self.DIM}{self.CYAN}[ITER]{self.RESET}"
-        elif kw_type == 'IF':
-            icon = "❓"
-            color = self.MAGENTA
-            type_label = f"{self.MAGENTA}[IF]{self.RESET}"
-        elif kw_type == 'ELSE IF':
-            icon = "❔"
-            color = self.MAGENTA
-            type_label = f"{self.MAGENTA}[ELIF]{self.RESET}"
-        elif kw_type == 'ELSE':
-            icon = "❕"
-            color = self.MAGENTA
-            type_label = f"{self.MAGENTA}[ELSE]{self.RESET}"
-        elif kw_type == 'TRY':
-            icon = "🎯"
-            color = self.BLUE
-            type_label = f"{self.BLUE}[TRY]{self.RESET}"
-        elif kw_type == 'EXCEPT':
-            icon = "⚠️"
-            color = self.YELLOW
-            type_label = f"{self.YELLOW}[EXCEPT]{self.RESET}"
-        elif kw_type == 'FINALLY':
-            icon = "✓"
-            color = self.BLUE
-            type_label = f"{self.BLUE}[FINALLY]{self.RESET}"
-        else:
-            icon = "→"
-            color = self.BLUE
-            type_label = ""
-
-        # Format arguments with type detection
-        args_str = ""
-        if args:
-            formatted_args = []
-            for arg in args[:4]:  # Show up to 4 args
-                arg_str = str(arg)
-                if len(arg_str) > 40:
-                    arg_str = arg_str[:37] + "..."
-
-                # Detect and color-code argument types
-                if arg_str.startswith('${') or arg_str.startswith('@{') or arg_str.startswith('&{'):
-                    # Variable
-                    formatted_args.append(f"{self.GREEN}{arg_str}{self.RESET}")
-                elif arg_str.isdigit() or (arg_str.replace('.', '').replace('-', '').isdigit()):
-                    # Number
-                    formatted_args.append(f"{self.CYAN}{arg_str}{self.RESET}")
-                elif arg_str.lower() in ('true', 'false', 'none', 'null'):
-                    # Boolean/None
-                    formatted_args.append(f"{self.MAGENTA}{arg_str}{self.RESET}")
-                else:
-                    # String
-                    formatted_args.append(f"{self.WHITE}{arg_str}{self.RESET}")
-
-            if len(args) > 4:
-                formatted_args.append(f"{self.DIM}+{len(args) - 4} more{self.RESET}")
-
-            args_str = f" {self.GRAY}({self.RESET}{', '.join(formatted_args)}{self.GRAY}){self.RESET}"
-
-        # Build the log line
-        line_info = f"{self.DIM}:{lineno}{self.RESET}" if lineno > 0 else ""
-        if type_label:
-            self._log(f"{indent}{icon} {type_label} {color}{self.BOLD}{display_name}{self.RESET}{args_str}{line_info}")
-        else:
-            self._log(f"{indent}{icon} {color}{display_name}{self.RESET}{args_str}{line_info}")
+        })
 
         # Check for breakpoint
-        if source and lineno > 0:
-            normalized_source = os.path.normpath(source)
-            if normalized_source in self.breakpoints and lineno in self.breakpoints[normalized_source]:
-                reason = f"Breakpoint hit: {os.path.basename(source)}:{lineno} in {display_name}"
+        bp_index = self._bp_index
+        if bp_index and source and lineno > 0:
+            bp_source = source if source in self._bp_sources else _norm(source)
+            if (bp_source, lineno) in bp_index:
+                reason = f"Breakpoint hit: {_base(source)}:{lineno} in {display_name}"
                 self._pause_execution(reason)
                 return
 
         # Check for stepping
-        if self.stepping_mode == 'over' and self.current_depth == self.step_depth:
+        stepping_mode = self.stepping_mode
+        if stepping_mode is None:
+            return
+        if stepping_mode == 'over' and depth == self.step_depth:
             reason = f"Step over: {display_name}"
             self._pause_execution(reason)
-            self.stepping_mode = None
-        elif self.stepping_mode == 'into':
+        elif stepping_mode == 'into':
             reason = f"Step into: {display_name}"
             self._pause_execution(reason)
-            self.stepping_mode = None
+
+    def _log_keyword(self, display_name: str, kw_type: str, args: List[Any], lineno: int, depth: int):
+        """Log keyword execution with type-specific formatting"""
+        indent = "  " * (depth - 1)
+
+        # Icon and color based on keyword type, then the name
+        parts = [indent, self._kw_heads.get(kw_type, self._kw_default_head), display_name, self.RESET]
+
+        # Format arguments with type detection
+        if args:
+            tpl_arg, arg_color = self._tpl_arg, self._arg_color
+            arg_parts = []
+            for arg in args[:4]:  # Show up to 4 args
+                arg_str = str(arg)
+                if len(arg_str) > 40:
+                    arg_str = arg_str[:37] + "..."
+                arg_parts.append(tpl_arg.format(arg_color(arg_str), arg_str))
+
+            parts += (self._tpl_args_open, ', '.join(arg_parts))
+            if len(args) > 4:
+                parts.append(self._tpl_more_args.format(len(args) - 4))
+            parts.append(self._tpl_args_close)
+
+        if lineno > 0:
+            parts.append(self._tpl_lineno.format(lineno))
+        self._log(''.join(parts))
+
+    def _arg_color(self, arg_str: str) -> str:
+        """Pick the display color for a keyword argument based on its type"""
+        first = arg_str[:1]
+        if first in _VARIABLE_SIGILS and arg_str[1:2] == '{':
+            # Variable
+            return self.GREEN
+        if first in _NUMERIC_CHARS and all(c in _NUMERIC_CHARS for c in arg_str) and arg_str.strip('.-'):
+            # Number
+            return self.CYAN
+        if len(arg_str) <= 5 and arg_str.lower() in _LITERAL_WORDS:
+            # Boolean/None
+            return self.MAGENTA
+        # String
+        return self.WHITE
 
     def end_keyword(self, name: str, attributes: Dict[str, Any]):
         """Called when a keyword ends"""
-        status = attributes.get('status', 'PASS')
-        kw_type = attributes.get('type', 'KEYWORD')
+        get = attributes.get
+        depth = self.current_depth
+        status = get('status', 'PASS')
+
+        # Passing keywords print nothing and need no stack bookkeeping
+        # while the debugger is inactive
+        if status == 'PASS' and not self._active and not self._verbose:
+            self.current_depth = depth - 1
+            return
+
+        display_name = get('kwname', name)
 
         # Check step out
-        if self.stepping_mode == 'out' and self.current_depth == self.step_depth:
-            display_name = attributes.get('kwname', name)
+        if self.stepping_mode == 'out' and depth == self.step_depth:
             reason = f"Step out: {display_name}"
             self._pause_execution(reason)
-            self.stepping_mode = None
 
         # Log keyword completion
-        display_name = attributes.get('kwname', name)
-        indent = "  " * (self.current_depth - 1)
+        indent = "  " * (depth - 1)
 
         if status == 'FAIL':
-            message = attributes.get('message', '')
+            message = get('message', '')
 
             # Enhanced failure display with box
-            self._log(f"{indent}{self.BG_RED}{self.WHITE}{self.BOLD} ✗ FAILED {self.RESET} {self.RED}{self.BOLD}{display_name}{self.RESET}")
+            self._log(self._tpl_kw_failed.format(indent, display_name))
 
             if message:
                 # Clean and format error message
-                lines = message.split('\n')
-                clean_lines = []
-                for line in lines[:5]:  # Show max 5 lines
+                tpl_fail_line = self._tpl_fail_line
+                for line in islice(_iter_lines(message), 5):  # Show max 5 lines
                     line = line.strip()
-                    if line and not line.startswith('0x') and not line.startswith('Stacktrace:'):
-                        clean_lines.append(line)
-
-                for line in clean_lines:
+                    if not line or line.startswith('0x') or line.startswith('Stacktrace:'):
+                        continue
                     if len(line) > 100:
                         line = line[:97] + '...'
-                    self._log(f"{indent}  {self.RED}│{self.RESET} {line}")
+                    self._log(tpl_fail_line.format(indent, line))
 
-        elif status == 'PASS' and kw_type in ('SETUP', 'TEARDOWN', 'FOR', 'IF', 'TRY'):
+        elif status == 'PASS' and self._verbose and get('type', 'KEYWORD') in _COMPLETION_TYPES:
             # Show completion for control structures
-            self._log(f"{indent}{self.GREEN}✓{self.RESET} {self.DIM}{display_name} completed{self.RESET}")
+            self._log(self._tpl_kw_completed.format(indent, display_name))
 
-        # Pop from stack
-        if self.keyword_stack:
-            self.keyword_stack.pop()
-        self.current_depth -= 1
+        # Pop from stack, if this keyword was pushed
+        stack = self.keyword_stack
+        if stack and stack[-1]['depth'] == depth:
+            stack.pop()
+        self.current_depth = depth - 1
 
     def _pause_execution(self, reason: str):
         """Pause execution and wait for user command"""
+        # Any pause ends the current step; a step chosen now sets a new one
+        self.stepping_mode = None
+
         # Draw pause box
         self._log("")
-        self._log(f"{self.YELLOW}{'═' * 60}{self.RESET}")
+        self._log(self._pause_rule)
         self._log(f"{self.YELLOW}║{self.RESET} {self.YELLOW}{self.BOLD}⏸  EXECUTION PAUSED{self.RESET}")
         self._log(f"{self.YELLOW}║{self.RESET} {self.WHITE}{reason}{self.RESET}")
-        self._log(f"{self.YELLOW}{'═' * 60}{self.RESET}")
+        self._log(self._pause_rule)
 
         # Show current call stack
         if self.keyword_stack:
@@ -328,57 +599,151 @@ class DebugListener:
                 depth_marker = "  " * i
                 self._log(f"  {depth_marker}→ {self.DIM}{frame['name']} ({frame.get('lineno', 0)}){self.RESET}")
 
-        # Export current variables
-        var_count = self._export_variables()
-        if var_count > 0:
-            self._log(f"{self.GREEN}✓{self.RESET} {self.DIM}Exported {var_count} variables{self.RESET}")
+        # Frames are cheap to write; variables are exported only on request
+        self._export_stack()
 
-        self._log(f"{self.YELLOW}{'─' * 60}{self.RESET}")
+        self._log(self._pause_divider)
         self._log(f"{self.DIM}Waiting for command (Continue/Step Over/Into/Out)...{self.RESET}")
         self._log("")
+        self._flush_log()
+
+        # Watch the control files before the debugger can see the pause, so
+        # no request written right after it is missed
+        watching = self._start_watching()
+
+        # Drop a variable request left over from an earlier pause that resumed
+        # before serving it; requests for this pause come after the pause file
+        try:
+            self.var_request_file.unlink()
+        except OSError:
+            pass
 
         # Create pause marker file
         try:
-            self.pause_file.write_text(reason, encoding='utf-8')
+            # Bytes, so Windows text mode does not turn the newline into CRLF
+            self.pause_file.write_bytes(f"paused\n{reason}".encode('utf-8'))
         except Exception as e:
             self._log(f"{self.RED}[ERROR] Failed to create pause file: {e}{self.RESET}")
+            self._flush_log()
+            self._update_active()
             return
 
-        # Poll for continue signal or step command
-        poll_count = 0
-        while self.pause_file.exists():
-            time.sleep(0.1)
-            poll_count += 1
-
-            # Reload breakpoints periodically (user may have added/removed)
-            if poll_count % 30 == 0:  # Every 3 seconds
+        # Wait for continue signal or step command. With watchdog we sleep until
+        # a control file changes; otherwise poll, starting fast and backing off
+        # so a prompt resume is picked up within a few milliseconds
+        delay = _POLL_INITIAL_DELAY
+        next_reload = time.monotonic() + _BREAKPOINT_RELOAD_INTERVAL
+        while True:
+            if watching:
+                # Wake at least in time for the next breakpoint reload
+                self._resume_event.wait(max(next_reload - time.monotonic(), 0))
+                self._resume_event.clear()
+            else:
+                time.sleep(delay)
+                delay = min(delay * 1.5, _POLL_MAX_DELAY)
+
+            # Reload breakpoints if the file changed (user may have added/removed).
+            # The watcher wakes us on edits; polling checks periodically
+            if watching or time.monotonic() >= next_reload:
                 self._load_breakpoints()
+                next_reload = time.monotonic() + _BREAKPOINT_RELOAD_INTERVAL
 
-            # Check for step command
-            if self.step_file.exists():
-                try:
-                    command = self.step_file.read_text(encoding='utf-8').strip()
-                    if command == 'over':
-                        self.stepping_mode = 'over'
-                        self.step_depth = self.current_depth
-                        self._log(f"{self.CYAN}{self.BOLD}▶ Step Over{self.RESET} (depth={self.current_depth})")
-                    elif command == 'into':
-                        self.stepping_mode = 'into'
-                        self._log(f"{self.CYAN}{self.BOLD}▶ Step Into{self.RESET}")
-                    elif command == 'out':
-                        self.stepping_mode = 'out'
-                        self.step_depth = self.current_depth - 1
-                        self._log(f"{self.CYAN}{self.BOLD}▶ Step Out{self.RESET} (to depth={self.current_depth - 1})")
-
-                    self.step_file.unlink()
-                    break
-                except Exception as e:
-                    self._log(f"{self.RED}[ERROR] Failed to read step command: {e}{self.RESET}")
+            # Export variables if the debugger asked for them
+            self._serve_variable_request()
+
+            # Check for continue or step command
+            if self._check_resume():
+                break
 
         # Resumed
+        self._update_active()
         self._log(f"{self.GREEN}{self.BOLD}▶ Execution Resumed{self.RESET}")
         self._log("")
 
+    def _check_resume(self) -> bool:
+        """Read the pause file, applying a step command; True once resumed"""
+        try:
+            content = self.pause_file.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            # Deleted: continue
+            return True
+        except Exception as e:
+            self._log(f"{self.RED}[ERROR] Failed to read pause file: {e}{self.RESET}")
+            return False
+
+        state = content.partition('\n')[0].strip()
+        if not state.startswith('step:'):
+            # Still paused, or the debugger is in the middle of writing
+            return False
+
+        command = state[5:]
+        if command == 'over':
+            self.stepping_mode = 'over'
+            self.step_depth = self.current_depth
+            self._log(f"{self.CYAN}{self.BOLD}▶ Step Over{self.RESET} (depth={self.current_depth})")
+        elif command == 'into':
+            self.stepping_mode = 'into'
+            self._log(f"{self.CYAN}{self.BOLD}▶ Step Into{self.RESET}")
+        elif command == 'out':
+            self.stepping_mode = 'out'
+            self.step_depth = self.current_depth - 1
+            self._log(f"{self.CYAN}{self.BOLD}▶ Step Out{self.RESET} (to depth={self.current_depth - 1})")
+
+        try:
+            self.pause_file.unlink()
+        except OSError:
+            pass
+        return True
+
+    def _start_watching(self) -> bool:
+        """Start watching the control files for changes, if watchdog is available"""
+        if self._observer is not None:
+            return True
+        if Observer is None:
+            return False
+
+        paths = {
+            os.path.abspath(p)
+            for p in (self.pause_file, self.var_request_file, self.breakpoint_file)
+        }
+        try:
+            observer = Observer()
+            handler = _ControlFileHandler(paths, self._resume_event)
+            for directory in {os.path.dirname(p) for p in paths}:
+                observer.schedule(handler, directory, recursive=False)
+            observer.start()
+        except Exception as e:
+            self._log(f"{self.YELLOW}[WARN] File watcher unavailable, polling instead: {e}{self.RESET}")
+            return False
+
+        self._observer = observer
+        return True
+
+    def _serve_variable_request(self):
+        """Export variables and remove the request file, if the debugger wrote one"""
+        if not self.var_request_file.exists():
+            return
+        var_count = self._export_variables()
+        if var_count > 0:
+            self._log(f"{self.GREEN}✓{self.RESET} {self.DIM}Exported {var_count} variables{self.RESET}")
+        try:
+            self.var_request_file.unlink()
+        except OSError:
+            pass
+        self._flush_log()
+
+    def _export_stack(self):
+        """Export the keyword call stack (innermost first) to JSON"""
+        frames = [
+            {'name': frame['kwname'], 'source': frame['source'], 'lineno': frame['lineno']}
+            for frame in reversed(self.keyword_stack)
+        ]
+        try:
+            with open(self.stack_file, 'wb') as f:
+                f.write(_dump_json(frames))
+        except Exception as e:
+            self._log(f"{self.RED}[ERROR] Failed to export call stack: {e}{self.RESET}")
+
     def _export_variables(self) -> int:
         """Export current Robot Framework variables to JSON"""
         try:
@@ -395,29 +760,37 @@ class DebugListener:
             # Get all variables from Robot Framework
             var_dict = bi.get_variables()
 
+            test_vars = variables['test']
+            suite_vars = variables['suite']
+            global_vars = variables['global']
+            local_vars = variables['local']
+
             for name, value in var_dict.items():
-                # Categorize variables
-                str_value = str(value)
+                if isinstance(value, str):
+                    str_value = value
+                elif isinstance(value, _CONTAINER_TYPES):
+                    # Only the first items are formatted, however big it is
+                    str_value = _value_repr(value)
+                else:
+                    str_value = str(value)
                 # Truncate very long values
-                if len(str_value) > 500:
-                    str_value = str_value[:497] + '...'
-
-                if name.startswith('${TEST'):
-                    variables['test'][name] = str_value
-                elif name.startswith('${SUITE'):
-                    variables['suite'][name] = str_value
-                elif name.startswith('$'):
-                    variables['local'][name] = str_value
-                elif name.startswith('@'):
-                    variables['local'][name] = str_value
-                elif name.startswith('&'):
-                    variables['local'][name] = str_value
+                if len(str_value) > _MAX_VALUE_LENGTH:
+                    str_value = str_value[:_MAX_VALUE_LENGTH - 3] + '...'
+
+                # Categorize variables: built-in test/suite ones by name,
+                # the rest by their sigil
+                if name in _TEST_VARIABLES:
+                    test_vars[name] = str_value
+                elif name in _SUITE_VARIABLES:
+                    suite_vars[name] = str_value
+                elif name[:1] in _VARIABLE_SIGILS:
+                    local_vars[name] = str_value
                 else:
-                    variables['global'][name] = str_value
+                    global_vars[name] = str_value
 
-            # Write to file
-            with open(self.variable_file, 'w', encoding='utf-8') as f:
-                json.dump(variables, f, indent=2, ensure_ascii=False)
+            # Write to file in one call
+            with open(self.variable_file, 'wb') as f:
+                f.write(_dump_json(variables))
 
             return sum(len(v) for v in variables.values())
 
@@ -427,10 +800,20 @@ class DebugListener:
 
     def log_message(self, message: Dict[str, Any]):
         """Called for log messages - show warnings and errors"""
-        level = message.get('level', 'INFO') if isinstance(message, dict) else getattr(message, 'level', 'INFO')
-        msg = message.get('message', '') if isinstance(message, dict) else getattr(message, 'message', '')
+        if isinstance(message, dict):
+            level, msg = message.get('level', 'INFO'), message.get('message', '')
+        else:
+            level, msg = getattr(message, 'level', 'INFO'), getattr(message, 'message', '')
 
         if level == 'WARN':
             self._log(f"{self.YELLOW}[WARN]{self.RESET} {msg[:150]}")
         elif level == 'ERROR':
             self._log(f"{self.RED}[ERROR]{self.RESET} {msg[:150]}")
+            self._flush_log()
+
+    def close(self):
+        """Called when the test execution ends - stop the file watcher and flush remaining output"""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+        self._flush_log()
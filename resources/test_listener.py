@@ -1,16 +1,47 @@
 """
 Robot Framework Listener for capturing test execution details.
 This listener captures failed keywords with their line numbers for better error reporting.
+
+By default results are streamed as JSON Lines to <output>.jsonl while the run
+progresses: a "call_stack" record for each failure stack and a "test" record
+per test, both written at test end, then a "summary" record in close().
+Set RF_LISTENER_LEGACY=1 to write the single listener_output.json document
+at close() instead.
 """
 import json
+import os
 import sys
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib encoder
+    orjson = None
+
+# Keyword call stack as a persistent linked list of
+# (name, attributes, depth, parent) nodes, None when empty. Pushing and popping
+# only rebind the top, so a failure can keep a reference to the current stack
+# instead of copying it. Frame dicts are built from the attributes Robot passed
+# to start_keyword (a fresh dict per call) only for stacks that are written out.
+_StackNode = Optional[Tuple[str, Dict[str, Any], int, Any]]
+
+
+def _dump_json(data: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
 
 
 class test_listener:
     """Listener that captures test execution details including failed keyword line numbers."""
     
     ROBOT_LISTENER_API_VERSION = 2
+
+    __slots__ = (
+        "_output_path", "failed_keywords", "last_fail_message", "test_results", "current_test",
+        "_stack_top", "_current_depth", "call_stacks", "_stack_count", "_stream",
+    )
     
     def __init__(self, output_path: str = "listener_output.json"):
         self._output_path = output_path
@@ -20,9 +51,20 @@ class test_listener:
         self.current_test: Optional[str] = None
 
         # NEW: Manual call stack tracking for nested keyword failures
-        self._keyword_stack: List[Dict[str, Any]] = []
+        self._stack_top: _StackNode = None
         self._current_depth = 0
-        self.call_stacks: Dict[str, List[Dict[str, Any]]] = {}
+        # stack_key -> (stack at failure, failure point); expanded in close()
+        self.call_stacks: Dict[str, Tuple[_StackNode, Dict[str, Any]]] = {}
+        self._stack_count = 0
+
+        # JSON Lines output, unless the legacy single-document writer is requested
+        self._stream = None
+        if output_path and os.environ.get("RF_LISTENER_LEGACY") != "1":
+            stream_path = os.path.splitext(output_path)[0] + ".jsonl"
+            try:
+                self._stream = open(stream_path, "wb", buffering=1 << 16)
+            except OSError as e:
+                print(f"Error opening listener output: {e}", file=sys.stderr)
     
     def start_test(self, name: str, attributes: Dict[str, Any]) -> None:
         """Called when a test case starts."""
@@ -30,13 +72,15 @@ class test_listener:
         self.failed_keywords = []
         self.last_fail_message = None
         # Reset call stack for new test
-        self._keyword_stack = []
+        self._stack_top = None
         self._current_depth = 0
     
     def end_test(self, name: str, attributes: Dict[str, Any]) -> None:
         """Called when a test case ends."""
         status = attributes.get("status", "FAIL")
         message = attributes.get("message", "")
+        # Handed over to the result as-is; self.failed_keywords is rebound below
+        failed_keywords = self.failed_keywords
 
         # Store test result with failed keywords info
         test_result = {
@@ -48,17 +92,34 @@ class test_listener:
             "endtime": attributes.get("endtime", ""),
             "source": attributes.get("source", ""),
             "lineno": attributes.get("lineno", 0),
-            "failed_keywords": self.failed_keywords.copy()
+            "failed_keywords": failed_keywords
         }
 
         # NEW: Link to call stack if failure occurred
-        if status == "FAIL" and self.failed_keywords:
+        if status == "FAIL" and failed_keywords:
             # Link to the first (and likely only) call stack for this test
             stack_key = f"{name}_0"
             if stack_key in self.call_stacks:
                 test_result["stack_trace_key"] = stack_key
 
-        self.test_results[name] = test_result
+        stream = self._stream
+        if stream is not None:
+            # Write this test's stacks and result now instead of keeping them
+            try:
+                for key, (top, failure_point) in self.call_stacks.items():
+                    stream.write(_dump_json({
+                        "type": "call_stack",
+                        "key": key,
+                        "data": self._expand_stack(top, failure_point)
+                    }) + b"\n")
+                stream.write(_dump_json({"type": "test", "data": test_result}) + b"\n")
+                # Flush per test so finished results survive a killed run
+                stream.flush()
+            except Exception as e:
+                print(f"Error writing listener output: {e}", file=sys.stderr)
+            self.call_stacks.clear()
+        else:
+            self.test_results[name] = test_result
 
         self.current_test = None
         self.failed_keywords = []
@@ -71,88 +132,117 @@ class test_listener:
 
     def start_keyword(self, name: str, attributes: Dict[str, Any]) -> None:
         """Called when a keyword starts. Tracks call stack for nested failures."""
-        self._current_depth += 1
+        depth = self._current_depth + 1
+        self._current_depth = depth
 
         # Push keyword onto call stack
-        keyword_frame = {
-            "name": name,
-            "kwname": attributes.get("kwname", name),
-            "libname": attributes.get("libname", ""),
-            "source": attributes.get("source", ""),
-            "lineno": attributes.get("lineno", 0),
-            "args": list(attributes.get("args", [])),
-            "depth": self._current_depth,
-            "type": attributes.get("type", "KEYWORD")
-        }
-        self._keyword_stack.append(keyword_frame)
+        self._stack_top = (name, attributes, depth, self._stack_top)
     
     def end_keyword(self, name: str, attributes: Dict[str, Any]) -> None:
         """Called when a keyword ends. Captures failed keywords with full call stack."""
-        status = attributes.get("status", "")
-        source = attributes.get("source", "")
+        get = attributes.get
+        status = get("status", "")
+        source = get("source", "")
 
         if status == "FAIL" and source:
+            kwname = get("kwname", name)
+            libname = get("libname", "")
+            lineno = get("lineno", 0)
+            kw_type = get("type", "KEYWORD")
+            fail_message = self.last_fail_message
+
             # OLD FORMAT: Maintain backward compatibility
             keyword_info = {
                 "name": name,
-                "kwname": attributes.get("kwname", name),
-                "libname": attributes.get("libname", ""),
+                "kwname": kwname,
+                "libname": libname,
                 "source": source,
-                "lineno": attributes.get("lineno", 0),
+                "lineno": lineno,
                 "status": status,
-                "message": self.last_fail_message or "",
-                "args": list(attributes.get("args", [])),
-                "type": attributes.get("type", "KEYWORD")
+                "message": fail_message or "",
+                "args": get("args", ()),
+                "type": kw_type
             }
             # Append (deepest last) instead of insert(0)
             self.failed_keywords.append(keyword_info)
 
             # NEW FORMAT: Capture full call stack with failure point
-            if self.current_test:
-                # Copy current stack + add failure point
-                call_stack = self._keyword_stack.copy()
-
+            current_test = self.current_test
+            if current_test:
                 # Mark the failing keyword
                 failure_point = {
                     "name": name,
-                    "kwname": attributes.get("kwname", name),
-                    "libname": attributes.get("libname", ""),
+                    "kwname": kwname,
+                    "libname": libname,
                     "source": source,
-                    "lineno": attributes.get("lineno", 0),
-                    "args": list(attributes.get("args", [])),
+                    "lineno": lineno,
+                    "args": get("args", ()),
                     "depth": self._current_depth,
-                    "type": attributes.get("type", "KEYWORD"),
+                    "type": kw_type,
                     "is_failure_point": True,
-                    "message": self.last_fail_message or attributes.get("message", ""),
+                    "message": fail_message or get("message", ""),
                     "status": "FAIL"
                 }
-                call_stack.append(failure_point)
 
-                # Store in call_stacks dict with unique key
-                stack_key = f"{self.current_test}_{len(self.call_stacks)}"
-                self.call_stacks[stack_key] = call_stack
+                # Store in call_stacks dict with unique key; the stack is
+                # shared, not copied, and expanded when writing output
+                stack_key = f"{current_test}_{self._stack_count}"
+                self._stack_count += 1
+                self.call_stacks[stack_key] = (self._stack_top, failure_point)
 
         # Pop from stack (whether PASS or FAIL)
-        if self._keyword_stack:
-            self._keyword_stack.pop()
+        top = self._stack_top
+        if top is not None:
+            self._stack_top = top[3]
         self._current_depth -= 1
     
     def close(self) -> None:
         """Called when the test execution ends. Writes results to file."""
-        if self._output_path:
+        stream = self._stream
+        if stream is not None:
+            try:
+                stream.write(_dump_json({"type": "summary", "version": 2}) + b"\n")
+                stream.close()
+            except Exception as e:
+                print(f"Error writing listener output: {e}", file=sys.stderr)
+            self._stream = None
+        elif self._output_path:
             try:
                 # Enhanced output with version and call stacks
                 output = {
                     "version": 2,
                     "test_results": self.test_results,
-                    "call_stacks": self.call_stacks
+                    "call_stacks": {
+                        key: self._expand_stack(top, failure_point)
+                        for key, (top, failure_point) in self.call_stacks.items()
+                    }
                 }
 
-                with open(self._output_path, "w", encoding="utf-8") as f:
-                    json.dump(output, f, indent=2, ensure_ascii=False)
+                with open(self._output_path, "wb") as f:
+                    f.write(_dump_json(output))
             except Exception as e:
                 print(f"Error writing listener output: {e}", file=sys.stderr)
 
+    @staticmethod
+    def _expand_stack(top: _StackNode, failure_point: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Turn a linked stack into the outermost-first frame list + failure point."""
+        frames = [failure_point]
+        while top is not None:
+            name, attributes, depth, top = top
+            get = attributes.get
+            frames.append({
+                "name": name,
+                "kwname": get("kwname", name),
+                "libname": get("libname", ""),
+                "source": get("source", ""),
+                "lineno": get("lineno", 0),
+                "args": get("args", ()),
+                "depth": depth,
+                "type": get("type", "KEYWORD")
+            })
+        frames.reverse()
+        return frames
+
 
 # Allow running as script for testing
 if __name__ == "__main__":
@@ -15,6 +15,7 @@ interface LaunchRequestArguments extends DebugProtocol.LaunchRequestArguments {
     env?: { [key: string]: string };
     python?: string;
     stopOnEntry?: boolean;
+    verbose?: boolean;
 }
 
 export class RobotFrameworkDebugSession extends LoggingDebugSession {
@@ -39,7 +40,8 @@ export class RobotFrameworkDebugSession extends LoggingDebugSession {
     private _pauseFile: string = '';
     private _breakpointFile: string = '';
     private _variableFile: string = '';
-    private _stepFile: string = '';
+    private _varRequestFile: string = '';
+    private _stackFile: string = '';
     private _pauseWatcher: fs.FSWatcher | undefined;
     private _currentVariables: any = {};
 
@@ -94,7 +96,8 @@ export class RobotFrameworkDebugSession extends LoggingDebugSession {
         this._pauseFile = path.join(cwd, '.rf_debug_pause');
         this._breakpointFile = path.join(cwd, '.rf_debug_breakpoints.json');
         this._variableFile = path.join(cwd, '.rf_debug_variables.json');
-        this._stepFile = path.join(cwd, '.rf_debug_step');
+        this._varRequestFile = path.join(cwd, '.rf_debug_request_vars');
+        this._stackFile = path.join(cwd, '.rf_debug_stack.json');
 
         // Clean up old debug files
         this._cleanupDebugFiles();
@@ -148,7 +151,10 @@ export class RobotFrameworkDebugSession extends LoggingDebugSession {
             FORCE_COLOR: '1',
             RF_DEBUG_PAUSE_FILE: this._pauseFile,
             RF_DEBUG_BP_FILE: this._breakpointFile,
-            RF_DEBUG_VAR_FILE: this._variableFile
+            RF_DEBUG_VAR_FILE: this._variableFile,
+            RF_DEBUG_VAR_REQUEST_FILE: this._varRequestFile,
+            RF_DEBUG_STACK_FILE: this._stackFile,
+            ...(args.verbose ? { RF_DEBUG_VERBOSE: '1' } : {})
         };
 
         this._robotProcess = spawn(python, robotArgs, {
@@ -233,9 +239,19 @@ export class RobotFrameworkDebugSession extends LoggingDebugSession {
     }
 
     protected stackTraceRequest(response: DebugProtocol.StackTraceResponse, _args: DebugProtocol.StackTraceArguments): void {
-        const frames: StackFrame[] = [
-            new StackFrame(0, 'Robot Framework', new Source('robot', ''), this._currentLine, 0)
-        ];
+        // Keyword frames written by the listener on pause (innermost first)
+        const frames: StackFrame[] = this._loadStackFromFile().map((frame: any, index: number) =>
+            new StackFrame(
+                index,
+                frame.name,
+                frame.source ? new Source(path.basename(frame.source), frame.source) : undefined,
+                frame.lineno || 0,
+                0
+            )
+        );
+        if (frames.length === 0) {
+            frames.push(new StackFrame(0, 'Robot Framework', new Source('robot', ''), this._currentLine, 0));
+        }
 
         response.body = {
             stackFrames: frames,
@@ -245,6 +261,12 @@ export class RobotFrameworkDebugSession extends LoggingDebugSession {
     }
 
     protected scopesRequest(response: DebugProtocol.ScopesResponse, _args: DebugProtocol.ScopesArguments): void {
+        // Ask the listener to export variables; it only does so on request, and
+        // only serves requests from its pause loop
+        if (this._isListenerPaused()) {
+            this._requestVariableExport();
+        }
+
         response.body = {
             scopes: [
                 new Scope("Test Variables", this._variableHandles.create("test"), false),
@@ -256,12 +278,21 @@ export class RobotFrameworkDebugSession extends LoggingDebugSession {
         this.sendResponse(response);
     }
 
-    protected variablesRequest(response: DebugProtocol.VariablesResponse, args: DebugProtocol.VariablesArguments): void {
+    protected async variablesRequest(response: DebugProtocol.VariablesResponse, args: DebugProtocol.VariablesArguments): Promise<void> {
         const variables: DebugProtocol.Variable[] = [];
         const scopeRef = this._variableHandles.get(args.variablesReference);
 
-        // Load live variables from JSON file exported by listener
-        const liveVars = this._loadVariablesFromFile();
+        // Load live variables from JSON file exported by listener. When it is not
+        // paused (e.g. stopOnEntry) nothing will be exported; use the last ones loaded
+        let liveVars = null;
+        if (scopeRef !== 'builtin') {
+            if (this._isListenerPaused()) {
+                await this._waitForVariableExport();
+                liveVars = this._loadVariablesFromFile();
+            } else {
+                liveVars = this._currentVariables;
+            }
+        }
 
         if (scopeRef === 'test' && liveVars && liveVars.test) {
             // Test-level variables from listener
@@ -319,11 +350,10 @@ export class RobotFrameworkDebugSession extends LoggingDebugSession {
     }
 
     protected nextRequest(response: DebugProtocol.NextResponse, _args: DebugProtocol.NextArguments): void {
-        // Step Over - write 'over' to step file
+        // Step Over - replace the pause state with 'step:over'
         try {
-            fs.writeFileSync(this._stepFile, 'over', { encoding: 'utf-8' });
             if (fs.existsSync(this._pauseFile)) {
-                fs.unlinkSync(this._pauseFile);
+                fs.writeFileSync(this._pauseFile, 'step:over\n', { encoding: 'utf-8' });
             }
             this.sendEvent(new OutputEvent(`▶  Step Over\n`, 'console'));
         } catch (error) {
@@ -333,11 +363,10 @@ export class RobotFrameworkDebugSession extends LoggingDebugSession {
     }
 
     protected stepInRequest(response: DebugProtocol.StepInResponse, _args: DebugProtocol.StepInArguments): void {
-        // Step Into - write 'into' to step file
+        // Step Into - replace the pause state with 'step:into'
         try {
-            fs.writeFileSync(this._stepFile, 'into', { encoding: 'utf-8' });
             if (fs.existsSync(this._pauseFile)) {
-                fs.unlinkSync(this._pauseFile);
+                fs.writeFileSync(this._pauseFile, 'step:into\n', { encoding: 'utf-8' });
             }
             this.sendEvent(new OutputEvent(`▶  Step Into\n`, 'console'));
         } catch (error) {
@@ -347,11 +376,10 @@ export class RobotFrameworkDebugSession extends LoggingDebugSession {
     }
 
     protected stepOutRequest(response: DebugProtocol.StepOutResponse, _args: DebugProtocol.StepOutArguments): void {
-        // Step Out - write 'out' to step file
+        // Step Out - replace the pause state with 'step:out'
         try {
-            fs.writeFileSync(this._stepFile, 'out', { encoding: 'utf-8' });
             if (fs.existsSync(this._pauseFile)) {
-                fs.unlinkSync(this._pauseFile);
+                fs.writeFileSync(this._pauseFile, 'step:out\n', { encoding: 'utf-8' });
             }
             this.sendEvent(new OutputEvent(`▶  Step Out\n`, 'console'));
         } catch (error) {
@@ -417,7 +445,10 @@ export class RobotFrameworkDebugSession extends LoggingDebugSession {
         /**
          * Clean up debug communication files
          */
-        const files = [this._pauseFile, this._breakpointFile, this._variableFile, this._stepFile];
+        const files = [
+            this._pauseFile, this._breakpointFile, this._variableFile,
+            this._varRequestFile, this._stackFile
+        ];
         for (const file of files) {
             if (file && fs.existsSync(file)) {
                 try {
@@ -463,28 +494,85 @@ export class RobotFrameworkDebugSession extends LoggingDebugSession {
                     return;
                 }
 
-                // Check if pause file was created (execution paused)
-                if (fs.existsSync(this._pauseFile)) {
-                    // Read pause reason
-                    try {
-                        const reason = fs.readFileSync(this._pauseFile, { encoding: 'utf-8' });
-                        this.sendEvent(new OutputEvent(`\n⏸  Paused: ${reason}\n`, 'console'));
-                    } catch (error) {
-                        this.sendEvent(new OutputEvent(`\n⏸  Paused\n`, 'console'));
-                    }
-
-                    // Load current variables
-                    this._loadVariablesFromFile();
-
-                    // Notify VS Code that execution stopped
-                    this.sendEvent(new StoppedEvent('breakpoint', RobotFrameworkDebugSession.THREAD_ID));
+                // Check if execution paused: the file holds 'paused' and the reason.
+                // It is also rewritten with a step command, or deleted to resume
+                const pause = this._readPauseFile();
+                if (!pause || pause.state !== 'paused') {
+                    return;
                 }
+
+                this.sendEvent(new OutputEvent(`\n⏸  Paused: ${pause.detail}\n`, 'console'));
+
+                // Notify VS Code that execution stopped
+                this.sendEvent(new StoppedEvent('breakpoint', RobotFrameworkDebugSession.THREAD_ID));
             });
         } catch (error) {
             this.sendEvent(new OutputEvent(`WARNING: Failed to setup pause watcher: ${error}\n`, 'console'));
         }
     }
 
+    private _readPauseFile(): { state: string; detail: string } | undefined {
+        /**
+         * Read the pause file as its first line (state) and the rest (detail).
+         * Undefined when it is missing or not fully written; accepts LF or CRLF
+         */
+        let content: string;
+        try {
+            content = fs.readFileSync(this._pauseFile, { encoding: 'utf-8' });
+        } catch (error) {
+            return undefined;
+        }
+        const match = /^([^\r\n]*)\r?\n([\s\S]*)$/.exec(content);
+        return match ? { state: match[1], detail: match[2] } : undefined;
+    }
+
+    private _isListenerPaused(): boolean {
+        /**
+         * Whether the listener is waiting in its pause loop ('paused' on the first line)
+         */
+        return this._readPauseFile()?.state === 'paused';
+    }
+
+    private _requestVariableExport(): void {
+        /**
+         * Write the request file the listener polls for while paused
+         */
+        if (!this._varRequestFile) return;
+
+        try {
+            fs.writeFileSync(this._varRequestFile, '', { encoding: 'utf-8' });
+        } catch (error) {
+            this.sendEvent(new OutputEvent(`WARNING: Failed to request variables: ${error}\n`, 'console'));
+        }
+    }
+
+    private async _waitForVariableExport(timeoutMs: number = 2000): Promise<void> {
+        /**
+         * Wait until the listener has exported variables and removed the request file
+         */
+        const deadline = Date.now() + timeoutMs;
+        while (this._varRequestFile && fs.existsSync(this._varRequestFile) && Date.now() < deadline
+            && this._isListenerPaused()) {
+            await new Promise(resolve => setTimeout(resolve, 10));
+        }
+    }
+
+    private _loadStackFromFile(): any[] {
+        /**
+         * Load the keyword call stack exported by listener on pause
+         */
+        if (!this._stackFile || !fs.existsSync(this._stackFile)) {
+            return [];
+        }
+
+        try {
+            const frames = JSON.parse(fs.readFileSync(this._stackFile, { encoding: 'utf-8' }));
+            return Array.isArray(frames) ? frames : [];
+        } catch (error) {
+            return [];
+        }
+    }
+
     private _loadVariablesFromFile(): any {
         /**
          * Load current variables from JSON file exported by listener
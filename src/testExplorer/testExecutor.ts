@@ -467,18 +467,52 @@ export class TestExecutor {
     }
 
     /**
-     * Parse the listener output JSON file for test results with accurate line numbers
+     * Read listener output: the JSON Lines stream (<output>.jsonl) written by default,
+     * or the single JSON document written with RF_LISTENER_LEGACY=1
+     */
+    private readListenerOutput(listenerOutputPath: string): any | null {
+        const streamPath = listenerOutputPath.replace(/\.json$/, '') + '.jsonl';
+        if (fs.existsSync(streamPath)) {
+            const data: any = { version: 2, test_results: {}, call_stacks: {} };
+            for (const line of fs.readFileSync(streamPath, 'utf-8').split('\n')) {
+                if (!line) {
+                    continue;
+                }
+                let record: any;
+                try {
+                    record = JSON.parse(line);
+                } catch {
+                    // Last line of a run that was killed mid-write
+                    continue;
+                }
+                if (record.type === 'test') {
+                    data.test_results[record.data.name] = record.data;
+                } else if (record.type === 'call_stack') {
+                    data.call_stacks[record.key] = record.data;
+                } else if (record.type === 'summary') {
+                    data.version = record.version;
+                }
+            }
+            return data;
+        }
+
+        if (fs.existsSync(listenerOutputPath)) {
+            return JSON.parse(fs.readFileSync(listenerOutputPath, 'utf-8'));
+        }
+        return null;
+    }
+
+    /**
+     * Parse the listener output for test results with accurate line numbers
      */
     private parseListenerOutput(listenerOutputPath: string, testName: string): TestResult | null {
         try {
-            if (!fs.existsSync(listenerOutputPath)) {
+            const data = this.readListenerOutput(listenerOutputPath);
+            if (!data) {
                 this.outputChannel.appendLine(`[DEBUG] Listener output not found: ${listenerOutputPath}`);
                 return null;
             }
 
-            const content = fs.readFileSync(listenerOutputPath, 'utf-8');
-            const data = JSON.parse(content);
-
             if (!data.test_results || !data.test_results[testName]) {
                 this.outputChannel.appendLine(`[DEBUG] Test '${testName}' not found in listener output`);
                 return null;